@@ -8,6 +8,7 @@ This is a minimal working example showing how to:
 """
 
 import os
+import sys
 import signal
 import asyncio
 from powerlobster_webhook import WebhookRelay, WebhookEvent
@@ -78,13 +79,21 @@ async def handle_message_received(message_data):
 
 
 # Graceful shutdown
-def signal_handler(sig, frame):
+def shutdown():
     print("\nShutting down...")
-    asyncio.create_task(relay.disconnect())
+    asyncio.ensure_future(relay.disconnect())
 
 
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+async def main():
+    loop = asyncio.get_running_loop()
+    
+    # Signal handlers run on the event loop; not available on Windows,
+    # where Ctrl+C raises KeyboardInterrupt instead
+    if sys.platform != "win32":
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, shutdown)
+    
+    await relay.connect_async()
 
 
 # Start
@@ -92,7 +101,9 @@ if __name__ == "__main__":
     print("🦞 Starting PowerLobster webhook relay...")
     
     try:
-        relay.connect()
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nShutting down...")
     except Exception as e:
         print(f"Failed to connect: {e}")
         exit(1)
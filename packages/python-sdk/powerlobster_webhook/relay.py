@@ -1,12 +1,18 @@
 """PowerLobster Webhook Relay client."""
 
 import asyncio
+import inspect
 import json
 import logging
+import re
+import ssl
+import threading
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+from urllib.parse import urlparse
 import websockets
 from websockets.client import WebSocketClientProtocol
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory
 
 from .types import (
     WebhookEvent,
@@ -14,9 +20,73 @@ from .types import (
     DisconnectedEvent,
     ReconnectingEvent
 )
-from .utils.signature import verify_signature
+from .utils.signature import new_hmac_template, verify_payload_signature, verify_signature
 from .utils.retry import exponential_backoff
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+
+def _now_ms() -> int:
+    """Wall-clock time in milliseconds, for timestamps sent over the wire."""
+    return time.time_ns() // 1_000_000
+
+
+# Seconds to wait for the server's auth response
+_AUTH_TIMEOUT = 10.0
+
+# Seconds disconnect() waits for queued acks to be sent
+_ACK_FLUSH_TIMEOUT = 5.0
+
+# TLS context shared by every relay in the process
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _shared_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide default TLS context, creating it on first use."""
+    # Building a default context loads the system CA store, which is slow
+    # and memory-hungry; websockets would otherwise do it on every connect
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+# Pre-encoded frames for the two most frequent outbound messages
+_PONG_PREFIX = b'{"type":"pong","timestamp":'
+_ACK_PREFIX = b'{"type":"ack","timestamp":'
+
+# Ids that can be spliced into a JSON string without escaping
+_PLAIN_ID = re.compile(r"[A-Za-z0-9_.:-]+")
+
+
+def _encode_ack(event_id: str) -> bytes:
+    """Encode an ack frame, splicing the event id into a fixed template."""
+    # Event ids are server-generated UUIDs; anything else goes through the
+    # regular encoder
+    if isinstance(event_id, str) and _PLAIN_ID.fullmatch(event_id):
+        return (
+            _ACK_PREFIX + str(_now_ms()).encode()
+            + b',"id":"' + event_id.encode() + b'"}'
+        )
+    
+    data = _dumps({"type": "ack", "id": event_id, "timestamp": _now_ms()})
+    return data if isinstance(data, bytes) else data.encode()
+
 
 class WebhookRelay:
     """
@@ -44,7 +114,8 @@ class WebhookRelay:
         max_reconnect_attempts: float = float('inf'),
         heartbeat_interval: float = 30.0,
         http_endpoint: Optional[str] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        compression: bool = False
     ):
         """
         Initialize WebhookRelay client.
@@ -58,6 +129,10 @@ class WebhookRelay:
             heartbeat_interval: Heartbeat check interval in seconds (default: 30.0)
             http_endpoint: Optional HTTP fallback endpoint
             logger: Custom logger instance
+            compression: Offer permessage-deflate (default: False). Only
+                takes effect if the relay server enables it. Tuned for low
+                CPU and memory (level 1, 4 KiB windows); leave off when the
+                client or server is CPU-bound rather than bandwidth-bound.
         """
         if not relay_url:
             raise ValueError("relay_url is required")
@@ -66,24 +141,33 @@ class WebhookRelay:
         
         self.relay_url = relay_url
         self.api_key = api_key
+        self._hmac_template = new_hmac_template(api_key)
         self.auto_reconnect = auto_reconnect
         self.reconnect_delay = reconnect_delay
         self.max_reconnect_attempts = max_reconnect_attempts
         self.heartbeat_interval = heartbeat_interval
         self.http_endpoint = http_endpoint
+        self.compression = compression
         self.logger = logger or logging.getLogger(__name__)
         
         # State
         self._ws: Optional[WebSocketClientProtocol] = None
+        self._recv_raw = False
         self._connected = False
         self._reconnect_attempt = 0
         self._should_reconnect = True
-        self._last_pong_time = 0.0
+        self._stop_event: Optional[asyncio.Event] = None
+        self._reconnect_after: Optional[float] = None
+        self._auth_future: Optional[asyncio.Future] = None
+        self._last_pong_time = 0.0  # time.monotonic(), never wall-clock
         self._webhook_url: Optional[str] = None
         self._session_id: Optional[str] = None
+        self._ack_batching = False
+        self._ack_queue: Optional[asyncio.Queue] = None
         
         # Event handlers
         self._webhook_handler: Optional[Callable] = None
+        self._webhook_is_async = False
         self._connected_handler: Optional[Callable] = None
         self._disconnected_handler: Optional[Callable] = None
         self._error_handler: Optional[Callable] = None
@@ -92,6 +176,22 @@ class WebhookRelay:
         # Tasks
         self._receive_task: Optional[asyncio.Task] = None
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # HTTP fallback
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_loop_lock = threading.Lock()
+        self._http_tasks: Set[asyncio.Task] = set()
+        
+        # Message type -> handler
+        self._message_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+            "webhook": self._handle_webhook,
+            "ping": self._handle_ping,
+            "auth_success": self._handle_auth_success,
+            "auth_error": self._handle_auth_error,
+            "error": self._handle_error,
+            "disconnect": self._handle_disconnect,
+        }
     
     def on_webhook(self, handler: Callable[[WebhookEvent], Any]):
         """
@@ -103,6 +203,11 @@ class WebhookRelay:
             ...     print(event.payload)
         """
         self._webhook_handler = handler
+        # Coroutine functions are awaited directly in _handle_webhook; other
+        # callables have their result checked for an awaitable
+        self._webhook_is_async = inspect.iscoroutinefunction(handler) or (
+            inspect.iscoroutinefunction(getattr(handler, "__call__", None))
+        )
         return handler
     
     def on_connected(self, handler: Callable[[ConnectedEvent], None]):
@@ -129,9 +234,27 @@ class WebhookRelay:
         """
         Connect to relay server (blocking).
         
-        Blocks until disconnected or error occurs.
+        Blocks until disconnected or error occurs. Runs on uvloop when it
+        is installed.
         """
-        asyncio.run(self.connect_async())
+        uvloop_run = getattr(uvloop, "run", None)
+        if uvloop_run is not None:
+            uvloop_run(self._connect_on_own_loop())
+            return
+        if uvloop is not None:
+            # uvloop < 0.18 has no run(); install its policy instead
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(self._connect_on_own_loop())
+    
+    async def _connect_on_own_loop(self):
+        """Run connect_async() on the loop created by connect()."""
+        # Python 3.12+: run tasks eagerly so coroutines that finish without
+        # suspending skip the event loop's ready queue. Only done here, on a
+        # loop the SDK owns; connect_async() leaves the caller's loop alone
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        
+        await self.connect_async()
     
     async def connect_async(self):
         """
@@ -139,10 +262,14 @@ class WebhookRelay:
         
         Returns when disconnected or error occurs.
         """
+        self._should_reconnect = True
+        self._stop_event = asyncio.Event()
+        self._ack_queue = self._new_ack_queue()
+        
         try:
-            await self._connect()
+            await self._run()
         except Exception as e:
-            self.logger.error(f"Connection failed: {e}")
+            self.logger.error("Connection failed: %s", e)
             if self._error_handler:
                 self._error_handler(e)
             raise
@@ -150,37 +277,59 @@ class WebhookRelay:
     async def disconnect(self):
         """Disconnect from relay server."""
         self._should_reconnect = False
+        if self._stop_event:
+            self._stop_event.set()
         
-        # Cancel tasks
-        if self._heartbeat_task:
-            self._heartbeat_task.cancel()
-            try:
-                await self._heartbeat_task
-            except asyncio.CancelledError:
-                pass
-        
-        if self._receive_task:
-            self._receive_task.cancel()
-            try:
-                await self._receive_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Close WebSocket
-        if self._ws:
-            await self._ws.close()
-            self._ws = None
-        
-        self._connected = False
+        await self._flush_acks()
+        await self._close_connection()
         self.logger.info("Disconnected from relay")
     
-    async def _connect(self):
-        """Internal connect implementation."""
-        self.logger.info(f"Connecting to relay: {self.relay_url}")
+    async def _run(self):
+        """Connect, then reconnect with backoff until stopped."""
+        # A flat loop rather than connect -> reconnect -> connect recursion,
+        # so long reconnect streaks don't grow the stack
+        while True:
+            await self._connect_once()
+            
+            if not (self._should_reconnect and self.auto_reconnect):
+                return
+            if not await self._backoff():
+                return
+    
+    async def _connect_once(self):
+        """Connect, authenticate and receive until the connection ends."""
+        self.logger.info("Connecting to relay: %s", self.relay_url)
         
         try:
             # Connect WebSocket
-            self._ws = await websockets.connect(self.relay_url)
+            if self.compression:
+                # Webhook JSON compresses well even with small windows and
+                # the fastest level; the relay mostly receives, so keep the
+                # per-connection zlib state and CPU cost low
+                extensions = [
+                    ClientPerMessageDeflateFactory(
+                        server_max_window_bits=12,
+                        client_max_window_bits=12,
+                        compress_settings={"level": 1, "memLevel": 5}
+                    )
+                ]
+            else:
+                extensions = None
+            connect_kwargs: Dict[str, Any] = {}
+            # urlparse() lower-cases the scheme, so "WSS://..." matches too;
+            # ws:// URLs get no ssl argument at all
+            if urlparse(self.relay_url).scheme == "wss":
+                connect_kwargs["ssl"] = _shared_ssl_context()
+            self._ws = await websockets.connect(
+                self.relay_url,
+                compression=None,
+                extensions=extensions,
+                **connect_kwargs
+            )
+            
+            # websockets >= 13 can hand over text frames as undecoded bytes,
+            # leaving UTF-8 validation to the JSON parser
+            self._recv_raw = "decode" in inspect.signature(self._ws.recv).parameters
             
             # Send authentication
             await self._send({
@@ -190,37 +339,98 @@ class WebhookRelay:
                 "version": "1.0.0"
             })
             
-            # Wait for auth response
-            message = await self._ws.recv()
-            await self._handle_message(json.loads(message))
+            # The auth response goes through the receive loop like every
+            # other message; wait until it settles the auth future
+            self._auth_future = asyncio.get_running_loop().create_future()
             
-            if not self._connected:
-                raise ConnectionError("Authentication failed")
+            # The ack queue outlives connections (but not connect_async()
+            # runs), so acks queued during a reconnect go out on the next
+            # one; the writer must be running before any webhook is handled
+            self._writer_task = asyncio.create_task(self._writer_loop())
+            receive_task = self._receive_task = asyncio.create_task(self._receive_loop())
             
-            # Start background tasks
-            self._receive_task = asyncio.create_task(self._receive_loop())
+            await asyncio.wait(
+                {self._auth_future, receive_task},
+                timeout=_AUTH_TIMEOUT,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not self._auth_future.done():
+                self._auth_future.cancel()
+                if not self._should_reconnect:
+                    return  # disconnect() was called while authenticating
+                if receive_task.done():
+                    raise ConnectionError("Connection closed before authentication")
+                raise ConnectionError("Authentication timed out")
+            self._auth_future.result()
+            
+            # Start heartbeat monitoring
             self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             
             # Wait for disconnect
-            await self._receive_task
+            try:
+                await receive_task
+            except asyncio.CancelledError:
+                # disconnect() cancels the receive task; return normally
+                if self._should_reconnect:
+                    raise
             
         except Exception as e:
-            self.logger.error(f"Connection error: {e}")
+            self.logger.error("Connection error: %s", e)
             if self._error_handler:
                 self._error_handler(e)
-            
-            # Auto-reconnect
-            if self._should_reconnect and self.auto_reconnect:
-                await self._reconnect()
+        
+        finally:
+            await self._close_connection()
+    
+    async def _close_connection(self):
+        """Stop per-connection tasks and close the WebSocket."""
+        self._connected = False
+        
+        # Cancel tasks (disconnect() may be called from a webhook handler,
+        # i.e. from inside the receive task, which can't await itself)
+        current = asyncio.current_task()
+        tasks = (self._writer_task, self._heartbeat_task, self._receive_task)
+        self._writer_task = self._heartbeat_task = self._receive_task = None
+        for task in tasks:
+            if not task or task is current:
+                continue
+            if not task.done():
+                task.cancel()
+            # Also collects the exception of a task that already failed,
+            # which would otherwise only show up as "never retrieved"
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.logger.error("Connection task failed: %s", e)
+        
+        # Close WebSocket
+        if self._ws:
+            ws, self._ws = self._ws, None
+            await ws.close()
     
     async def _receive_loop(self):
         """Receive messages from WebSocket."""
+        ws = self._ws
         try:
-            async for message in self._ws:
-                data = json.loads(message)
-                await self._handle_message(data)
+            # Stop once the connection is torn down (e.g. disconnect() from a
+            # handler), even if more frames are already buffered
+            if self._recv_raw:
+                while self._ws is ws:
+                    message = await ws.recv(decode=False)
+                    await self._handle_message(_loads(message))
+            else:
+                async for message in ws:
+                    data = _loads(message)
+                    await self._handle_message(data)
+                    if self._ws is not ws:
+                        break
+        except websockets.exceptions.ConnectionClosedOK:
+            # Clean close; same as the async-for path ending normally
+            pass
         except websockets.exceptions.ConnectionClosed as e:
-            self.logger.info(f"Connection closed: {e}")
+            self.logger.info("Connection closed: %s", e)
             self._connected = False
             
             event = DisconnectedEvent(
@@ -229,12 +439,8 @@ class WebhookRelay:
             )
             if self._disconnected_handler:
                 self._disconnected_handler(event)
-            
-            # Auto-reconnect
-            if self._should_reconnect and self.auto_reconnect:
-                await self._reconnect()
         except Exception as e:
-            self.logger.error(f"Receive loop error: {e}")
+            self.logger.error("Receive loop error: %s", e)
             if self._error_handler:
                 self._error_handler(e)
     
@@ -245,7 +451,7 @@ class WebhookRelay:
         while self._connected:
             await asyncio.sleep(self.heartbeat_interval)
             
-            now = time.time()
+            now = time.monotonic()
             time_since_pong = now - self._last_pong_time
             
             if time_since_pong > timeout:
@@ -254,30 +460,79 @@ class WebhookRelay:
                     await self._ws.close()
                 break
     
+    async def _writer_loop(self):
+        """Send queued acknowledgments, coalescing bursts into one frame."""
+        while True:
+            # Block on the first ack, then drain whatever else is queued
+            ids = [await self._ack_queue.get()]
+            while True:
+                try:
+                    ids.append(self._ack_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            # None is the stop marker queued by _flush_acks()
+            stop = None in ids
+            if stop:
+                ids = ids[:ids.index(None)]
+            
+            try:
+                if self._ack_batching and len(ids) > 1:
+                    await self._send({
+                        "type": "ack_batch",
+                        "ids": ids,
+                        "timestamp": _now_ms()
+                    })
+                else:
+                    for event_id in ids:
+                        await self._send_raw(_encode_ack(event_id))
+            except websockets.exceptions.ConnectionClosed as e:
+                # Unacked events are redelivered by the server
+                self.logger.warning("Failed to send acknowledgment: %s", e)
+            
+            if stop:
+                return
+    
+    async def _flush_acks(self):
+        """Let the writer send every queued ack, then stop it."""
+        writer = self._writer_task
+        if not writer or writer.done() or writer is asyncio.current_task():
+            return
+        
+        self._ack_queue.put_nowait(None)
+        try:
+            await asyncio.wait_for(writer, _ACK_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning("Timed out sending pending acknowledgments")
+    
+    def _new_ack_queue(self) -> asyncio.Queue:
+        """
+        Create the ack queue for a connect_async() run.
+        
+        Queues bind to the event loop they are first used on, so each run
+        gets a new one; acks still pending from a previous run are carried
+        over, and a leftover stop marker from _flush_acks() is dropped.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        old, self._ack_queue = self._ack_queue, None
+        while old is not None:
+            try:
+                event_id = old.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if event_id is not None:
+                queue.put_nowait(event_id)
+        return queue
+    
     async def _handle_message(self, message: Dict[str, Any]):
         """Handle incoming WebSocket message."""
         msg_type = message.get("type")
+        handler = self._message_handlers.get(msg_type)
         
-        if msg_type == "auth_success":
-            await self._handle_auth_success(message)
-        
-        elif msg_type == "auth_error":
-            await self._handle_auth_error(message)
-        
-        elif msg_type == "webhook":
-            await self._handle_webhook(message)
-        
-        elif msg_type == "ping":
-            await self._handle_ping(message)
-        
-        elif msg_type == "error":
-            await self._handle_error(message)
-        
-        elif msg_type == "disconnect":
-            await self._handle_disconnect(message)
-        
+        if handler:
+            await handler(message)
         else:
-            self.logger.warning(f"Unknown message type: {msg_type}")
+            self.logger.warning("Unknown message type: %s", msg_type)
     
     async def _handle_auth_success(self, message: Dict[str, Any]):
         """Handle successful authentication."""
@@ -285,9 +540,12 @@ class WebhookRelay:
         self._reconnect_attempt = 0
         self._webhook_url = message.get("webhook_url")
         self._session_id = message.get("session_id")
-        self._last_pong_time = time.time()
+        self._ack_batching = "ack_batch" in (message.get("features") or ())
+        self._last_pong_time = time.monotonic()
+        if self._auth_future and not self._auth_future.done():
+            self._auth_future.set_result(None)
         
-        self.logger.info(f"Authentication successful (session: {self._session_id})")
+        self.logger.info("Authentication successful (session: %s)", self._session_id)
         
         if self._connected_handler:
             event = ConnectedEvent(
@@ -300,9 +558,12 @@ class WebhookRelay:
     async def _handle_auth_error(self, message: Dict[str, Any]):
         """Handle authentication error."""
         error_msg = message.get("message", "Authentication failed")
-        self.logger.error(f"Authentication error: {error_msg}")
+        self.logger.error("Authentication error: %s", error_msg)
         
         error = ConnectionError(error_msg)
+        if self._fail_auth(error):
+            return
+        
         if self._error_handler:
             self._error_handler(error)
         
@@ -311,74 +572,81 @@ class WebhookRelay:
     async def _handle_webhook(self, message: Dict[str, Any]):
         """Handle incoming webhook event."""
         try:
-            event = WebhookEvent(
-                id=message["id"],
-                timestamp=message["timestamp"],
-                signature=message["signature"],
-                payload=message["payload"]
-            )
+            event = WebhookEvent.from_message(message)
             
-            self.logger.debug(f"Received webhook: {event.id}")
+            self.logger.debug("Received webhook: %s", event.id)
             
             if not self._webhook_handler:
                 self.logger.warning("No webhook handler registered")
-                await self._acknowledge(event.id)
+                self._acknowledge(event.id)
                 return
             
             # Call user handler
             should_ack = True
             try:
-                result = self._webhook_handler(event)
-                
-                # Handle async handler
-                if asyncio.iscoroutine(result):
-                    result = await result
+                if self._webhook_is_async:
+                    result = await self._webhook_handler(event)
+                else:
+                    result = self._webhook_handler(event)
+                    # Plain callables may still return a coroutine (lambdas,
+                    # def-based decorators); only sync handlers pay this check
+                    if inspect.isawaitable(result):
+                        result = await result
                 
                 # Check if handler returned False
                 if result is False:
                     should_ack = False
             
             except Exception as e:
-                self.logger.error(f"Webhook handler error: {e}")
+                self.logger.error("Webhook handler error: %s", e)
                 if self._error_handler:
                     self._error_handler(e)
                 should_ack = False  # Don't ack on error (will retry)
             
             # Auto-acknowledge
             if should_ack:
-                await self._acknowledge(event.id)
+                self._acknowledge(event.id)
         
         except Exception as e:
-            self.logger.error(f"Failed to process webhook: {e}")
+            self.logger.error("Failed to process webhook: %s", e)
             if self._error_handler:
                 self._error_handler(e)
     
     async def _handle_ping(self, message: Dict[str, Any]):
         """Handle ping (heartbeat)."""
-        self._last_pong_time = time.time()
+        self._last_pong_time = time.monotonic()
         
         # Respond with pong
-        await self._send({
-            "type": "pong",
-            "timestamp": int(time.time() * 1000)
-        })
+        await self._send_raw(_PONG_PREFIX + str(_now_ms()).encode() + b"}")
     
     async def _handle_error(self, message: Dict[str, Any]):
         """Handle error message from server."""
         error_msg = message.get("message", "Server error")
-        self.logger.error(f"Server error: {error_msg}")
+        self.logger.error("Server error: %s", error_msg)
+        
+        # The relay server reports rejected credentials as a plain error
+        if self._fail_auth(ConnectionError(error_msg)):
+            return
         
         error = Exception(error_msg)
         if self._error_handler:
             self._error_handler(error)
     
+    def _fail_auth(self, error: Exception) -> bool:
+        """Fail a pending authentication; False if none is pending."""
+        if self._auth_future is None or self._auth_future.done():
+            return False
+        
+        self._auth_future.set_exception(error)
+        return True
+    
     async def _handle_disconnect(self, message: Dict[str, Any]):
         """Handle graceful disconnect from server."""
         reason = message.get("reason", "unknown")
         msg = message.get("message")
         reconnect_after = message.get("reconnect_after_ms")
         
-        self.logger.warning(f"Server requested disconnect: {reason}")
+        self.logger.warning("Server requested disconnect: %s", reason)
         
         event = DisconnectedEvent(
             reason=reason,
@@ -389,26 +657,35 @@ class WebhookRelay:
         if self._disconnected_handler:
             self._disconnected_handler(event)
         
-        # Reconnect after delay if requested
+        # Reconnect after the requested delay instead of the usual backoff
         if reconnect_after and self.auto_reconnect:
-            await asyncio.sleep(reconnect_after / 1000)
-            await self._reconnect()
+            self._reconnect_after = reconnect_after / 1000
+            if self._ws:
+                await self._ws.close()
     
-    async def _reconnect(self):
-        """Reconnect with exponential backoff."""
+    async def _backoff(self) -> bool:
+        """
+        Wait before the next reconnect attempt.
+        
+        Returns:
+            False if reconnecting should stop instead
+        """
         if self._reconnect_attempt >= self.max_reconnect_attempts:
             error = Exception("Max reconnect attempts reached")
             self.logger.error(str(error))
             if self._error_handler:
                 self._error_handler(error)
-            return
+            return False
         
         self._reconnect_attempt += 1
-        delay = exponential_backoff(self._reconnect_attempt, self.reconnect_delay)
+        if self._reconnect_after is not None:
+            delay, self._reconnect_after = self._reconnect_after, None
+        else:
+            delay = exponential_backoff(self._reconnect_attempt, self.reconnect_delay)
         
         self.logger.info(
-            f"Reconnecting in {delay:.1f}s... "
-            f"(attempt {self._reconnect_attempt}/{self.max_reconnect_attempts})"
+            "Reconnecting in %.1fs... (attempt %s/%s)",
+            delay, self._reconnect_attempt, self.max_reconnect_attempts
         )
         
         if self._reconnecting_handler:
@@ -419,16 +696,19 @@ class WebhookRelay:
             )
             self._reconnecting_handler(event)
         
-        await asyncio.sleep(delay)
-        await self._connect()
+        # Sleep, but wake up early if disconnect() is called
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+        except asyncio.TimeoutError:
+            return True
+        return False
     
-    async def _acknowledge(self, event_id: str):
-        """Send acknowledgment for webhook event."""
-        await self._send({
-            "type": "ack",
-            "id": event_id,
-            "timestamp": int(time.time() * 1000)
-        })
+    def _acknowledge(self, event_id: str):
+        """Queue acknowledgment for webhook event."""
+        if self._ack_queue is None:
+            self.logger.warning("Cannot acknowledge %s: not connected", event_id)
+            return
+        self._ack_queue.put_nowait(event_id)
     
     async def _send(self, message: Dict[str, Any]):
         """Send message to server."""
@@ -436,42 +716,158 @@ class WebhookRelay:
             self.logger.warning("Cannot send message: not connected")
             return
         
-        await self._ws.send(json.dumps(message))
+        await self._ws.send(_dumps(message))
+    
+    async def _send_raw(self, data: bytes):
+        """Send pre-encoded JSON message to server."""
+        if not self._ws:
+            self.logger.warning("Cannot send message: not connected")
+            return
+        
+        await self._ws.send(data)
     
-    def handle_http_webhook(self, payload: Dict[str, Any], headers: Dict[str, str]) -> bool:
+    def handle_http_webhook(
+        self,
+        body: Union[bytes, str, Dict[str, Any]],
+        headers: Dict[str, str]
+    ) -> bool:
         """
         Handle HTTP webhook (fallback mode).
         
+        Intended for synchronous (WSGI) frameworks. Async handlers run on a
+        persistent background event loop. If called from inside a running
+        event loop, an async handler is scheduled on that loop instead of
+        awaited; use handle_http_webhook_async() there to wait for it.
+        
         Args:
-            payload: Webhook payload
+            body: Raw request body (e.g. ``request.get_data()``). A parsed
+                payload dict is still accepted, but is verified by
+                re-serializing it, which breaks if the sender's key order
+                or formatting differs.
             headers: HTTP headers
         
         Returns:
             True if webhook was valid and processed
         """
-        signature = headers.get("x-relay-signature")
-        timestamp = headers.get("x-relay-timestamp")
-        
-        if not verify_signature(payload, timestamp, signature, self.api_key):
-            self.logger.warning("Invalid HTTP webhook signature")
+        event = self._parse_http_webhook(body, headers)
+        if event is None:
             return False
         
-        # Create event
-        event = WebhookEvent(
-            id=payload.get("id", ""),
-            timestamp=int(timestamp),
-            signature=signature,
-            payload=payload.get("payload", {})
-        )
+        # Call handler
+        if self._webhook_handler:
+            try:
+                result = self._webhook_handler(event)
+                if asyncio.iscoroutine(result):
+                    try:
+                        asyncio.get_running_loop()
+                    except RuntimeError:
+                        future = asyncio.run_coroutine_threadsafe(
+                            result, self._get_background_loop()
+                        )
+                        future.result()
+                    else:
+                        task = asyncio.ensure_future(result)
+                        self._http_tasks.add(task)
+                        task.add_done_callback(self._on_http_task_done)
+            except Exception as e:
+                self.logger.error("HTTP webhook handler error: %s", e)
+                return False
+        
+        return True
+    
+    async def handle_http_webhook_async(
+        self,
+        body: Union[bytes, str, Dict[str, Any]],
+        headers: Dict[str, str]
+    ) -> bool:
+        """
+        Handle HTTP webhook (fallback mode) from an async (ASGI) framework.
+        
+        Args:
+            body: Raw request body (e.g. ``await request.body()``)
+            headers: HTTP headers
+        
+        Returns:
+            True if webhook was valid and processed
+        """
+        event = self._parse_http_webhook(body, headers)
+        if event is None:
+            return False
         
         # Call handler
         if self._webhook_handler:
             try:
                 result = self._webhook_handler(event)
                 if asyncio.iscoroutine(result):
-                    asyncio.run(result)
+                    await result
             except Exception as e:
-                self.logger.error(f"HTTP webhook handler error: {e}")
+                self.logger.error("HTTP webhook handler error: %s", e)
                 return False
         
         return True
+    
+    def _parse_http_webhook(
+        self,
+        body: Union[bytes, str, Dict[str, Any]],
+        headers: Dict[str, str]
+    ) -> Optional[WebhookEvent]:
+        """Verify an HTTP webhook and build its event (None if invalid)."""
+        signature = headers.get("x-relay-signature")
+        timestamp = headers.get("x-relay-timestamp")
+        
+        if not signature or not timestamp:
+            self.logger.warning("Missing HTTP webhook signature headers")
+            return None
+        
+        # The header string is what was signed; the integer is only for the event
+        try:
+            timestamp_ms = int(timestamp)
+        except ValueError:
+            self.logger.warning("Invalid HTTP webhook timestamp: %s", timestamp)
+            return None
+        
+        if isinstance(body, dict):
+            payload = body
+            valid = verify_payload_signature(payload, timestamp, signature, self._hmac_template)
+        else:
+            valid = verify_signature(body, timestamp, signature, self._hmac_template)
+        
+        if not valid:
+            self.logger.warning("Invalid HTTP webhook signature")
+            return None
+        
+        if not isinstance(body, dict):
+            # Both orjson and json decode errors are ValueErrors
+            try:
+                payload = _loads(body)
+            except ValueError as e:
+                self.logger.warning("Invalid HTTP webhook body: %s", e)
+                return None
+            if not isinstance(payload, dict):
+                self.logger.warning("Invalid HTTP webhook body: expected a JSON object")
+                return None
+        
+        return WebhookEvent(
+            id=payload.get("id", ""),
+            timestamp=timestamp_ms,
+            signature=signature,
+            payload=payload.get("payload", {})
+        )
+    
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop used for async handlers in sync HTTP mode."""
+        with self._bg_loop_lock:
+            if self._bg_loop is None:
+                self._bg_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._bg_loop.run_forever,
+                    name="powerlobster-webhook-http",
+                    daemon=True
+                ).start()
+            return self._bg_loop
+    
+    def _on_http_task_done(self, task: asyncio.Task):
+        """Log failures of HTTP webhook handlers scheduled on a running loop."""
+        self._http_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error("HTTP webhook handler error: %s", task.exception())
@@ -3,18 +3,34 @@
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Protocol
 import logging
+import sys
 
+# slots=True is only accepted by dataclass() on Python 3.10+. Slotted events
+# have no __dict__, so on 3.10+ assigning an attribute that isn't a field
+# raises AttributeError; fields themselves stay writable.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class WebhookEvent:
     """Webhook event from PowerLobster."""
     id: str
     timestamp: int
     signature: str
     payload: Dict[str, Any]
-
-
-@dataclass
+    
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "WebhookEvent":
+        """Build an event from a relay ``webhook`` message."""
+        return cls(
+            message["id"],
+            message["timestamp"],
+            message["signature"],
+            message["payload"]
+        )
+
+
+@dataclass(**_SLOTS)
 class ConnectedEvent:
     """Connection success event."""
     webhook_url: str
@@ -22,7 +38,7 @@ class ConnectedEvent:
     timestamp: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DisconnectedEvent:
     """Disconnection event."""
     reason: str
@@ -30,7 +46,7 @@ class DisconnectedEvent:
     reconnect_after_ms: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReconnectingEvent:
     """Reconnection attempt event."""
     attempt: int
@@ -2,6 +2,12 @@
 
 import random
 
+_MAX_DELAY = 30.0  # 30 seconds max
+
+# 2 ** (attempt - 1) for attempts 1..32; later attempts reuse the last entry
+# (the delay is capped at _MAX_DELAY long before that anyway)
+_BACKOFF_FACTORS = tuple(float(1 << i) for i in range(32))
+
 
 def exponential_backoff(attempt: int, base_delay: float = 1.0) -> float:
     """
@@ -14,10 +20,8 @@ def exponential_backoff(attempt: int, base_delay: float = 1.0) -> float:
     Returns:
         Delay in seconds
     """
-    max_delay = 30.0  # 30 seconds max
-    delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-    
-    # Add jitter (±20%)
-    jitter = delay * 0.2 * (random.random() - 0.5)
+    index = min(max(attempt - 1, 0), len(_BACKOFF_FACTORS) - 1)
+    delay = min(base_delay * _BACKOFF_FACTORS[index], _MAX_DELAY)
     
-    return delay + jitter
+    # Add jitter (±10%)
+    return delay * (0.9 + 0.2 * random.random())
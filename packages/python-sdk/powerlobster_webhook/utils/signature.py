@@ -3,36 +3,87 @@
 import hmac
 import hashlib
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Union
+
+
+def new_hmac_template(secret: Union[bytes, str]) -> hmac.HMAC:
+    """
+    Create an HMAC-SHA256 object keyed with secret and no message yet.
+    
+    Copying it skips the per-call key setup in verify_signature().
+    """
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return hmac.new(secret, None, hashlib.sha256)
 
 
 def verify_signature(
-    payload: Dict[str, Any],
+    body: Union[bytes, str],
     timestamp: str,
     signature: str,
-    secret: str
+    secret: Union[bytes, str, hmac.HMAC]
 ) -> bool:
     """
-    Verify HMAC-SHA256 signature.
+    Verify HMAC-SHA256 signature over the raw request body.
     
     Args:
-        payload: Webhook payload
+        body: Raw request body, exactly as received
         timestamp: Unix timestamp (milliseconds)
         signature: HMAC signature (sha256=...)
-        secret: Shared secret key
+        secret: Shared secret key, or an HMAC-SHA256 object already keyed
+            with it (see new_hmac_template); the object is copied, not
+            modified
     
     Returns:
         True if signature is valid
+    
+    Raises:
+        TypeError: If body is a parsed payload rather than the raw body
     """
-    body = json.dumps(payload, separators=(',', ':'))
-    signed_payload = f"{timestamp}.{body}"
+    if isinstance(body, dict):
+        raise TypeError(
+            "verify_signature() now takes the raw request body; "
+            "use verify_payload_signature() for a parsed payload dict"
+        )
+    if isinstance(body, str):
+        body = body.encode()
+    if isinstance(secret, hmac.HMAC):
+        mac = secret.copy()
+    else:
+        mac = new_hmac_template(secret)
     
-    expected_signature = hmac.new(
-        secret.encode(),
-        signed_payload.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    mac.update(timestamp.encode() + b"." + body)
+    expected_signature = mac.hexdigest()
     
     received_signature = signature.replace('sha256=', '')
     
     return hmac.compare_digest(expected_signature, received_signature)
+
+
+def verify_payload_signature(
+    payload: Dict[str, Any],
+    timestamp: str,
+    signature: str,
+    secret: Union[bytes, str, hmac.HMAC]
+) -> bool:
+    """
+    Verify HMAC-SHA256 signature of an already-parsed payload.
+    
+    The payload is re-serialized as compact JSON before verification, so
+    this only succeeds when the sender used the same key order and
+    formatting. Prefer verify_signature() with the raw body.
+    
+    Args:
+        payload: Webhook payload
+        timestamp: Unix timestamp (milliseconds)
+        signature: HMAC signature (sha256=...)
+        secret: Shared secret key
+    
+    Returns:
+        True if signature is valid
+    """
+    # Always the stdlib encoder, so which signatures verify doesn't depend
+    # on optional dependencies
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    
+    return verify_signature(body, timestamp, signature, secret)
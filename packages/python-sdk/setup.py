@@ -30,6 +30,10 @@ setup(
         "websockets>=11.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.9",
+            "uvloop>=0.18; platform_system != 'Windows'",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-asyncio>=0.21",
@@ -0,0 +1,109 @@
+"""Shared fixtures for the Python SDK tests."""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+import websockets
+
+
+class FakeRelayServer:
+    """
+    Local WebSocket server speaking the relay's side of the SDK protocol.
+    
+    Use as an async context manager; leaving the block waits for every
+    connection handler to finish, so everything the client sent is in
+    received afterwards.
+    
+    Args:
+        auth: "success" to accept the client, "error" to reject it with
+            auth_error, "silent" to never answer the auth message
+        webhooks: Event ids to deliver after a successful auth
+        drop_after_auth: Number of connections to close right after auth
+        features: Features advertised in auth_success
+    """
+    
+    def __init__(
+        self,
+        auth: str = "success",
+        webhooks: Sequence[str] = (),
+        drop_after_auth: int = 0,
+        features: Sequence[str] = ("ack_batch",)
+    ):
+        self.auth = auth
+        self.webhooks = list(webhooks)
+        self.drop_after_auth = drop_after_auth
+        self.features = list(features)
+        self.connections = 0
+        self.received: List[Dict[str, Any]] = []
+        self.url: Optional[str] = None
+        self._server = None
+    
+    async def __aenter__(self) -> "FakeRelayServer":
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+    
+    @property
+    def acked_ids(self) -> List[str]:
+        """Event ids acknowledged so far, from ack and ack_batch frames."""
+        ids: List[str] = []
+        for message in self.received:
+            if message.get("type") == "ack":
+                ids.append(message["id"])
+            elif message.get("type") == "ack_batch":
+                ids.extend(message["ids"])
+        return ids
+    
+    async def _handle(self, ws, path=None):
+        self.connections += 1
+        connection = self.connections
+        try:
+            self.received.append(json.loads(await ws.recv()))
+            
+            if self.auth == "error":
+                await ws.send(json.dumps({
+                    "type": "auth_error",
+                    "message": "Invalid API key"
+                }))
+                await ws.close()
+                return
+            if self.auth == "silent":
+                await ws.wait_closed()
+                return
+            
+            await ws.send(json.dumps({
+                "type": "auth_success",
+                "webhook_url": "https://relay.test/api/v1/webhook/relay_test",
+                "session_id": f"session-{connection}",
+                "features": self.features
+            }))
+            if connection <= self.drop_after_auth:
+                await ws.close()
+                return
+            
+            for event_id in self.webhooks:
+                await ws.send(json.dumps({
+                    "type": "webhook",
+                    "id": event_id,
+                    "timestamp": 1700000000000,
+                    "signature": "sha256=test",
+                    "payload": {"event": "test.event", "data": {}}
+                }))
+            
+            async for message in ws:
+                self.received.append(json.loads(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+@pytest.fixture
+def relay_server():
+    """Factory for FakeRelayServer; enter the result with ``async with``."""
+    return FakeRelayServer
+
@@ -0,0 +1,152 @@
+"""Tests for WebhookRelay against a local relay server."""
+
+import asyncio
+
+import pytest
+
+import powerlobster_webhook.relay as relay_module
+from powerlobster_webhook import WebhookRelay
+
+
+def make_relay(url: str, **kwargs) -> WebhookRelay:
+    """Create a relay client for the test server."""
+    kwargs.setdefault("auto_reconnect", False)
+    return WebhookRelay(url, "sk_test", **kwargs)
+
+
+async def wait_connected(relay: WebhookRelay, task: asyncio.Task, timeout: float = 5.0):
+    """Wait until relay has authenticated, failing if task ends first."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not relay._connected:
+        if task.done():
+            task.result()
+            pytest.fail("connect_async() returned before authenticating")
+        if loop.time() > deadline:
+            pytest.fail("relay did not authenticate in time")
+        await asyncio.sleep(0.01)
+
+
+async def test_auth_success(relay_server):
+    async with relay_server() as server:
+        relay = make_relay(server.url)
+        connected = []
+        relay.on_connected(connected.append)
+        
+        task = asyncio.create_task(relay.connect_async())
+        await wait_connected(relay, task)
+        await relay.disconnect()
+        await asyncio.wait_for(task, 5)
+    
+    assert server.received[0]["type"] == "auth"
+    assert server.received[0]["api_key"] == "sk_test"
+    assert [event.session_id for event in connected] == ["session-1"]
+    assert connected[0].webhook_url == "https://relay.test/api/v1/webhook/relay_test"
+
+
+async def test_auth_error(relay_server):
+    async with relay_server(auth="error") as server:
+        relay = make_relay(server.url)
+        errors = []
+        relay.on_error(errors.append)
+        
+        await asyncio.wait_for(relay.connect_async(), 5)
+    
+    assert not relay._connected
+    assert len(errors) == 1
+    assert isinstance(errors[0], ConnectionError)
+    assert str(errors[0]) == "Invalid API key"
+
+
+async def test_auth_timeout(relay_server, monkeypatch):
+    monkeypatch.setattr(relay_module, "_AUTH_TIMEOUT", 0.2)
+    
+    async with relay_server(auth="silent") as server:
+        relay = make_relay(server.url)
+        errors = []
+        relay.on_error(errors.append)
+        
+        await asyncio.wait_for(relay.connect_async(), 5)
+    
+    assert [str(error) for error in errors] == ["Authentication timed out"]
+
+
+async def test_reconnects_after_connection_drop(relay_server, monkeypatch):
+    monkeypatch.setattr(relay_module, "exponential_backoff", lambda attempt, base: 0.01)
+    
+    async with relay_server(drop_after_auth=1) as server:
+        relay = make_relay(server.url, auto_reconnect=True)
+        connected = []
+        reconnecting = []
+        relay.on_connected(connected.append)
+        relay.on_reconnecting(reconnecting.append)
+        
+        task = asyncio.create_task(relay.connect_async())
+        for _ in range(500):
+            if len(connected) == 2 and relay._connected:
+                break
+            assert not task.done()
+            await asyncio.sleep(0.01)
+        await relay.disconnect()
+        await asyncio.wait_for(task, 5)
+    
+    assert server.connections == 2
+    assert [event.session_id for event in connected] == ["session-1", "session-2"]
+    assert [event.attempt for event in reconnecting] == [1]
+
+
+async def test_webhooks_are_acknowledged(relay_server):
+    async with relay_server(webhooks=["evt_1", "evt_2"]) as server:
+        relay = make_relay(server.url)
+        received = []
+        
+        @relay.on_webhook
+        async def handle(event):
+            received.append(event.id)
+            if len(received) == 2:
+                asyncio.get_running_loop().create_task(relay.disconnect())
+        
+        await asyncio.wait_for(relay.connect_async(), 5)
+    
+    assert received == ["evt_1", "evt_2"]
+    assert sorted(server.acked_ids) == ["evt_1", "evt_2"]
+
+
+@pytest.mark.parametrize("features", [["ack_batch"], []])
+async def test_disconnect_flushes_queued_acks(relay_server, features):
+    async with relay_server(features=features) as server:
+        relay = make_relay(server.url)
+        
+        task = asyncio.create_task(relay.connect_async())
+        await wait_connected(relay, task)
+        
+        # Queued but not yet picked up by the writer task
+        relay._acknowledge("evt_1")
+        relay._acknowledge("evt_2")
+        await relay.disconnect()
+        await asyncio.wait_for(task, 5)
+    
+    assert server.acked_ids == ["evt_1", "evt_2"]
+    ack_types = {message["type"] for message in server.received[1:]}
+    assert ack_types == ({"ack_batch"} if features else {"ack"})
+
+
+def test_relay_can_be_reused_on_a_new_loop(relay_server):
+    relay = WebhookRelay("ws://127.0.0.1:1", "sk_test", auto_reconnect=False)
+    servers = []
+    
+    async def run_once(event_id):
+        async with relay_server() as server:
+            relay.relay_url = server.url
+            
+            task = asyncio.create_task(relay.connect_async())
+            await wait_connected(relay, task)
+            relay._acknowledge(event_id)
+            await relay.disconnect()
+            await asyncio.wait_for(task, 5)
+        servers.append(server)
+    
+    asyncio.run(run_once("evt_1"))
+    asyncio.run(run_once("evt_2"))
+    
+    assert [server.acked_ids for server in servers] == [["evt_1"], ["evt_2"]]
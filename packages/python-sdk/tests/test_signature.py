@@ -0,0 +1,53 @@
+"""Tests for HMAC signature verification."""
+
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from powerlobster_webhook.utils.signature import (
+    new_hmac_template,
+    verify_payload_signature,
+    verify_signature,
+)
+
+SECRET = "sk_test"
+TIMESTAMP = "1700000000000"
+
+
+def sign(body: bytes, timestamp: str = TIMESTAMP) -> str:
+    """Sign body the way the relay server does."""
+    digest = hmac.new(SECRET.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return "sha256=" + digest.hexdigest()
+
+
+def test_verify_signature_raw_body():
+    body = b'{"event": "test.event", "data": {}}'
+    
+    assert verify_signature(body, TIMESTAMP, sign(body), SECRET)
+    assert verify_signature(body.decode(), TIMESTAMP, sign(body), SECRET)
+    assert not verify_signature(body + b" ", TIMESTAMP, sign(body), SECRET)
+    assert not verify_signature(body, "1700000000001", sign(body), SECRET)
+
+
+def test_verify_signature_with_template():
+    body = b'{"event":"test.event"}'
+    template = new_hmac_template(SECRET)
+    
+    assert verify_signature(body, TIMESTAMP, sign(body), template)
+    # The template is copied, so it can be reused
+    assert verify_signature(body, TIMESTAMP, sign(body), template)
+
+
+def test_verify_signature_rejects_dict():
+    with pytest.raises(TypeError, match="verify_payload_signature"):
+        verify_signature({"event": "test.event"}, TIMESTAMP, "sha256=", SECRET)
+
+
+def test_verify_payload_signature():
+    payload = {"event": "test.event", "data": {"id": 1}}
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    
+    assert verify_payload_signature(payload, TIMESTAMP, sign(body), SECRET)
+    assert not verify_payload_signature(payload, TIMESTAMP, sign(body + b" "), SECRET)
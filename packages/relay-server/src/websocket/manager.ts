@@ -119,6 +119,7 @@ export class WebSocketManager {
             relay_id: relayId,
             webhook_url: `${process.env.PUBLIC_URL}/api/v1/webhook/${relayId}`,
             session_id: sessionId,
+            features: ['ack_batch'],
             timestamp: Date.now()
           }));
           
@@ -153,6 +154,14 @@ export class WebSocketManager {
             await this.handleAck(relayId!, message.id);
             break;
 
+          case 'ack_batch':
+            if (Array.isArray(message.ids)) {
+              for (const id of message.ids) {
+                await this.handleAck(relayId!, id);
+              }
+            }
+            break;
+
           case 'get_queued':
             await this.handleGetQueued(relayId!);
             break;